@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import platform
+import struct
 from collections.abc import Iterable
 
 import unicorn
@@ -57,6 +58,15 @@ class Architecture(DatabaseEntry):
         self.max_insn_size = max(self.insn_sizes)
         self.min_insn_size = min(self.insn_sizes)
         self.uc_supported = self.uc_arch is not None
+
+        #Precompiled struct for word encoding/decoding - struct.Struct.pack/unpack
+        #are C fast paths that skip format-string parsing on every word access
+        word_format = {2: 'H', 4: 'I', 8: 'Q'}.get(self.word_size)
+        if word_format is None:
+            self._word_struct = None
+        else:
+            prefix = '<' if endian is Endian.LITTLE else '>'
+            self._word_struct = struct.Struct(prefix + word_format)
         self.fully_supported = self.uc_supported and all(isa.ks_supported and isa.cs_supported for isa in self.isas)
         self.gdb_supported = self.gdb_name is not None
         self.elf_supported = self.elf_machine is not None
@@ -79,12 +89,16 @@ class Architecture(DatabaseEntry):
     
     def encode_word(self, value):
         """Convert an int to bytes representing a word in this architecture"""
+        if self._word_struct is not None and 0 <= value <= self.word_mask:
+            return self._word_struct.pack(value)
         return self.endian.encode_int(value, self.word_size)
 
     def decode_word(self, data, *, signed=False):
         """Convert bytes representing a word in this architecture to an int"""
         if len(data) != self.word_size:
             raise ValueError(f'Invalid word length {len(data)}, expected {self.word_size}')
+        if self._word_struct is not None and not signed:
+            return self._word_struct.unpack(data)[0]
         return self.endian.decode_int(data, signed=signed)
 
     def pointer_to_address(self, pointer):
@@ -40,6 +40,7 @@ class InstructionSet(DatabaseEntry):
         super().__init__(name, alt_names)
         self.insn_alignment = insn_alignment
         self.insn_sizes = sorted(set(insn_sizes))
+        self.insn_sizes_desc = tuple(reversed(self.insn_sizes))
         self.min_insn_size = min(self.insn_sizes)
         self.max_insn_size = max(self.insn_sizes)
         self.ks_arch = ks_arch
@@ -51,17 +52,22 @@ class InstructionSet(DatabaseEntry):
             self.cs_mode |= endian.cs_endian
 
         self.ks_supported = self.ks_arch is not None
-        if self.ks_supported:
-            self._ks = keystone.Ks(self.ks_arch, self.ks_mode)
-        else:
-            self._ks = None
-        
         self.cs_supported = self.cs_arch is not None
-        if self.cs_supported:
+        #The engines are created lazily on first use - instantiating them for
+        #every registered ISA noticeably slows down importing megastone.
+        self._ks: keystone.Ks = None
+        self._cs: capstone.Cs = None
+
+    def _get_ks(self):
+        if self._ks is None:
+            self._ks = keystone.Ks(self.ks_arch, self.ks_mode)
+        return self._ks
+
+    def _get_cs(self):
+        if self._cs is None:
             self._cs = capstone.Cs(self.cs_arch, self.cs_mode)
             self._cs.detail = True
-        else:
-            self._cs = None
+        return self._cs
 
     def assemble(self, assembly, address=0) -> bytes:
         """
@@ -71,7 +77,7 @@ class InstructionSet(DatabaseEntry):
         Raise an `AssemblyError` if the assembly is invalid.
         """
         try:
-            data, _ = self._ks.asm(assembly, addr=address, as_bytes=True)
+            data, _ = self._get_ks().asm(assembly, addr=address, as_bytes=True)
         except keystone.KsError as e:
             raise AssemblyError(f'Assembly failed: {str(e)}') from e
         if data is None:
@@ -91,7 +97,7 @@ class InstructionSet(DatabaseEntry):
         if count is None:
             count = 0
         try:
-            for insn in self._cs.disasm(code, offset=address, count=count):
+            for insn in self._get_cs().disasm(code, offset=address, count=count):
                 yield Instruction(insn)
         except capstone.CsError as e:
             raise DisassemblyError(f'Failed to disassemble: {str(e)}') from e
@@ -109,12 +109,19 @@ class RegisterState(NamespaceMapping[int]):
 
     def __init__(self, arch: Architecture):
         self._arch = arch
-        self._generic_regs = dict(
+        #Flatten all register names (including the generic aliases) into a single
+        #dict so that hot register accesses resolve with one lookup.
+        lookup: dict[str, Register] = dict(arch.regs._regs) if arch.regs is not None else {}
+        generic_regs = dict(
             gen_pc=arch.pc_reg,
             gen_sp=arch.sp_reg,
             retaddr=arch.retaddr_reg,
             retval=arch.retval_reg
         )
+        for name, reg in generic_regs.items():
+            if reg is not None:
+                lookup[name] = reg
+        self._lookup = lookup
 
     @abc.abstractmethod
     def read(self, reg: Register) -> int:
@@ -154,7 +161,4 @@ class RegisterState(NamespaceMapping[int]):
             raise AttributeError('No such register') from e
 
     def _name_to_reg(self, name):
-        reg = self._generic_regs.get(name, None)
-        if reg is not None:
-            return reg
-        return self._arch.regs[name]
\ No newline at end of file
+        return self._lookup[name]
\ No newline at end of file
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Generator
+import bisect
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import TypeVar, Type, Generic
 
@@ -11,10 +12,14 @@ T = TypeVar('T', bound='DatabaseEntry')
 
 
 class Database(Generic[T]):
+    __slots__ = ('_entries', '_keys', '_mapping', '_parent', '_all')
+
     def __init__(self, parent: Database[T] = None):
         self._entries: list[T] = []
+        self._keys: list[str] = []  #entry names, parallel to _entries, kept sorted
         self._mapping: dict[str, T] = {}
         self._parent = parent
+        self._all: tuple[T, ...] = ()  #snapshot of _entries, rebuilt on register()
 
     def register(self, entry: T):
         if entry in self._entries:
@@ -23,8 +28,10 @@ class Database(Generic[T]):
             if name in self._mapping:
                 raise RuntimeError(f'Duplicate entry name: {name}')
 
-        self._entries.append(entry)
-        self._entries.sort(key=lambda e: e.name)
+        index = bisect.bisect(self._keys, entry.name)
+        self._entries.insert(index, entry)
+        self._keys.insert(index, entry.name)
+        self._all = tuple(self._entries)
         for name in entry.all_names:
             self._mapping[name] = entry
 
@@ -35,7 +42,7 @@ class Database(Generic[T]):
         return self._mapping.get(name.lower())
 
     def all(self):
-        yield from self._entries
+        return self._all
 
 
 class DatabaseEntry:
@@ -45,6 +52,10 @@ class DatabaseEntry:
     Each subclass of DatabaseEntry represents a database that can be searched.
     """
 
+    #name/alt_names are read constantly during lookups - slots make them
+    #C-level reads instead of __dict__ lookups (subclasses still get a __dict__)
+    __slots__ = ('name', 'alt_names', 'all_names')
+
     _db: Database
 
     @classmethod
@@ -65,15 +76,16 @@ class DatabaseEntry:
         return instance
 
     @classmethod
-    def all(cls: Type[T]) -> Generator[T]:
-        """Return an iterable of all registered instances."""
+    def all(cls: Type[T]) -> tuple[T, ...]:
+        """Return a tuple of all registered instances."""
         return cls._db.all()
 
     def __init__(self, name: str, alt_names: Iterable[str] = ()):
         self.name = name.lower()
         alt_names = set(name.lower() for name in alt_names)
-        self.alt_names = sorted(alt_names - {self.name})
-        self.all_names = sorted(alt_names | {self.name})
+        #Lowercased once at registration and frozen - lookups never touch these
+        self.alt_names = tuple(sorted(alt_names - {self.name}))
+        self.all_names = tuple(sorted(alt_names | {self.name}))
 
         self._db.register(self)
         
@@ -2,9 +2,10 @@ import abc
 from dataclasses import dataclass
 import enum
 import functools
+import struct
 
 from megastone.mem import Memory, Access
-from megastone.arch import Register, RegisterState, InstructionSet
+from megastone.arch import Endian, Register, RegisterState, InstructionSet
 from .hooks import HOOK_STOP, Hook, HookFunc, HOOK_BREAK, ReplaceFunctionHookFunc, HookType
 
 
@@ -34,6 +35,9 @@ class Debugger(abc.ABC):
         self.start_pc = None
 
         self._stop_hook: Hook = None #Hook that stopped execution
+        #On single-ISA architectures the ISA can never change, so we can skip
+        #the register read in isa_from_regs() on every run/step.
+        self._static_isa = self.arch.isas[0] if len(self.arch.isas) == 1 else None
 
     @property
     def isa(self):
@@ -41,6 +45,8 @@ class Debugger(abc.ABC):
         #The default implementation assumes that a change to the ISA (i.e. by writing to PC)
         #is immediately visible in the other registers (e.g. the CPSR)
         #This is true for Unicorn but this property may need to be overriden in other implementations.
+        if self._static_isa is not None:
+            return self._static_isa
         return self.arch.isa_from_regs(self.regs)
 
     @property
@@ -151,6 +157,25 @@ class Debugger(abc.ABC):
         finally:
             self.remove_hook(hook)
 
+    def run_until_cond(self, cond, count=None):
+        """
+        Run until `cond(dbg)` returns a truthy value and return the StopReason.
+
+        This stays inside a single `run()` call instead of stepping one
+        instruction at a time, which is much faster for emulators since the
+        engine's code cache stays warm between instructions.
+        `count`, if given, limits the number of instructions to run.
+        """
+        def func(dbg):
+            if cond(dbg):
+                dbg.stop()
+
+        hook = self.add_code_hook(func)
+        try:
+            return self.run(count)
+        finally:
+            self.remove_hook(hook)
+
     def run_function(self, address, *, isa=None):
         """
         Run until the given function returns and return its return value.
@@ -177,6 +202,16 @@ class Debugger(abc.ABC):
 
     def _handle_hook(self, hook: Hook, access: Access = None, int_num: int = None):
         #Implementations should call this on every hook that is triggered
+        if not getattr(hook.func, 'needs_context', True):
+            #Fast path for simple hooks - they only need curr_hook (for stop()),
+            #not the access/interrupt context
+            self.curr_hook = hook
+            try:
+                hook.func(self)
+            finally:
+                self.curr_hook = None
+            return
+
         self.curr_hook = hook
         self.curr_access = access
         self.curr_int_num = int_num
@@ -243,30 +278,48 @@ class StackView:
     This class can be indexes to access the words on the stack.
     """
 
+    WORD_FORMATS = {2: 'H', 4: 'I', 8: 'Q'}
+
     def __init__(self, dbg: Debugger):
         self._dbg = dbg
+        #Cache hot attributes - they never change over the Debugger's lifetime
+        self._mem = dbg.mem
+        self._word_size = dbg.arch.word_size
+        prefix = '<' if dbg.arch.endian is Endian.LITTLE else '>'
+        word_format = self.WORD_FORMATS.get(self._word_size)
+        self._word_format = None if word_format is None else prefix + word_format
 
     def get_address(self, index: int):
         """Return the address of the word at the given index."""
-        return self._dbg.sp + index * self._dbg.arch.word_size
+        return self._dbg.sp + index * self._word_size
 
     def __getitem__(self, key):
         if isinstance(key, slice):
             if key.stop is None:
                 raise ValueError('Stack slices must have a stop index')
-            return [self[i] for i in range(*key.indices(key.stop))]
-        return self._dbg.mem.read_word(self.get_address(key))
+            indices = range(*key.indices(key.stop))
+            if len(indices) > 1 and indices.step == 1 and self._word_format is not None:
+                return self._read_words(indices[0], len(indices))
+            return [self[i] for i in indices]
+        return self._mem.read_word(self.get_address(key))
+
+    def _read_words(self, index, count):
+        #Read a contiguous run of stack words in one memory access
+        data = self._mem.read(self.get_address(index), count * self._word_size)
+        return list(struct.unpack(self._word_format[0] + str(count) + self._word_format[1], data))
 
     def __setitem__(self, key, value):
-        return self._dbg.mem.write_word(self.get_address(key), value)
+        return self._mem.write_word(self.get_address(key), value)
 
     def push(self, value):
         """Push the given value to the stack."""
-        self._dbg.sp -= self._dbg.arch.word_size
-        self[0] = value
-    
+        sp = self._dbg.sp - self._word_size
+        self._dbg.sp = sp
+        self._mem.write_word(sp, value)
+
     def pop(self) -> int:
         """Pop a value from the stack and return it."""
-        value = self[0]
-        self._dbg.sp += self._dbg.arch.word_size
+        sp = self._dbg.sp
+        value = self._mem.read_word(sp)
+        self._dbg.sp = sp + self._word_size
         return value
\ No newline at end of file
@@ -51,6 +51,11 @@ ACCESS_TYPE_TO_HOOK_TYPE = {value: key for key, value in HOOK_TYPE_TO_ACCESS_TYP
 class HookFunc(abc.ABC):
     """ABC that can be used to define hooks (you can also use a plain function)."""
 
+    #True if the hook inspects curr_access/curr_int_num.
+    #Simple hooks that at most call dbg.stop() can set this to False
+    #to skip some per-invocation bookkeeping in the hot hook path.
+    needs_context = True
+
     @abc.abstractmethod
     def __call__(self, dbg: Debugger):
         """
@@ -78,6 +83,8 @@ class Hook:
 class StopHookFunc(HookFunc):
     """Basic hook that simply stops execution."""
 
+    needs_context = False
+
     def __call__(self, dbg: Debugger):
         dbg.stop()
 
@@ -89,7 +96,9 @@ HOOK_STOP = StopHookFunc()
 
 class StopOnceHookFunc(HookFunc):
     """A hook that will stop execution once, then remove itself."""
-    
+
+    needs_context = False
+
     def __call__(self, dbg: Debugger):
         dbg.remove_hook(dbg.curr_hook)
         dbg.stop()
@@ -103,6 +112,8 @@ HOOK_STOP_ONCE = StopOnceHookFunc()
 class BreakHookFunc(HookFunc):
     """Breakpoint-like hook: stops execution unless starting execution from its address."""
 
+    needs_context = False
+
     def __call__(self, dbg: Debugger):
         if dbg.start_pc != dbg.pc:
             dbg.stop()
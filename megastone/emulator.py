@@ -1,15 +1,16 @@
 from __future__ import annotations
 
+import array
 from contextlib import contextmanager
 from megastone.mem.errors import MemoryReadError, MemoryWriteError
 
 import unicorn
 
-from megastone.debug import CPUError, Debugger, Hook, InvalidInsnError, MemFaultError, FaultCause, HookType
+from megastone.debug import CPUError, Debugger, Hook, InvalidInsnError, MemFaultError, FaultCause, HookType, HOOK_STOP, HOOK_BREAK
 from megastone.mem import MappableMemory, Access, AccessType, Segment, SegmentMemory
 from megastone.arch import Architecture, Register, RegisterState
 from megastone.util import round_up, round_down
-from megastone.errors import UnsupportedError, warning
+from megastone.errors import MegastoneError, UnsupportedError, warning
 from megastone.files import ExecFile
 
 
@@ -52,16 +53,36 @@ UC_ACCESS_TO_FAULT_CAUSE = {
     unicorn.UC_MEM_FETCH_PROT: FaultCause.PROTECTED
 }
 
+#The UC_MEM_* codes are a small dense enum, so the dicts above can be flattened
+#into tuples indexed directly by the access code for the hot hook paths.
+def _access_table(mapping):
+    size = max(mapping) + 1
+    return tuple(mapping.get(code) for code in range(size))
+
+UC_ACCESS_TO_ACCESS_TYPE_TABLE = _access_table(UC_ACCESS_TO_ACCESS_TYPE)
+UC_ACCESS_TO_FAULT_CAUSE_TABLE = _access_table(UC_ACCESS_TO_FAULT_CAUSE)
+
 STACK_NAME = 'stack'
 DEFAULT_STACK_SIZE = 0x100000
 RET_FLAG_NAME = 'ret_flag'
 
+def _build_perms_table():
+    #Permissions are 3 bits, so the full mapping fits in an 8-entry table
+    table = []
+    for value in range(8):
+        perms = AccessType(value)
+        result = 0
+        for atype, flag in ACCESS_TYPE_TO_UC_PROT.items():
+            if perms & atype:
+                result |= flag
+        table.append(result)
+    return tuple(table)
+
+PERMS_TO_UC_PROT_TABLE = _build_perms_table()
+
+
 def perms_to_uc_prot(perms: AccessType):
-    result = 0
-    for atype, flag in ACCESS_TYPE_TO_UC_PROT.items():
-        if perms & atype:
-            result |= flag
-    return result
+    return PERMS_TO_UC_PROT_TABLE[perms.value & 7]
 
 
 def uc_prot_to_perms(uc_prot: int):
@@ -80,6 +101,17 @@ class UnicornMemory(MappableMemory):
     def _handle_new_segment(self, seg: Segment):
         self._init_mapping(seg.start, seg.size, seg.perms)
 
+    def _handle_removed_segment(self, seg: Segment):
+        start = round_down(seg.start, Emulator.PAGE_SIZE)
+        end = round_up(seg.end, Emulator.PAGE_SIZE)
+        #Keep boundary pages that other segments still occupy
+        while start < end and self._overlaps_range(start, start + Emulator.PAGE_SIZE):
+            start += Emulator.PAGE_SIZE
+        while end > start and self._overlaps_range(end - Emulator.PAGE_SIZE, end):
+            end -= Emulator.PAGE_SIZE
+        if start < end:
+            self._uc.mem_unmap(start, end - start)
+
     def _read(self, address, size):
         try:
             return bytes(self._uc.mem_read(address, size))
@@ -139,12 +171,16 @@ class UnicornRegisterState(RegisterState):
     def __init__(self, arch, uc: unicorn.Uc):
         super().__init__(arch)
         self._uc = uc
+        #Bind the Unicorn methods once so hot register accesses skip the
+        #attribute lookup on the Uc object.
+        self._reg_read = uc.reg_read
+        self._reg_write = uc.reg_write
 
     def read(self, reg: Register):
-        return self._uc.reg_read(reg.uc_id)
+        return self._reg_read(reg.uc_id)
 
     def write(self, reg: Register, value):
-        self._uc.reg_write(reg.uc_id, value)
+        self._reg_write(reg.uc_id, value)
 
 
 class Emulator(Debugger):
@@ -166,7 +202,10 @@ class Emulator(Debugger):
         self._fault_access: Access = None
         #since hooks are called from C, exceptions raised inside a hook won't propagate up to emu_start()
         #so we save the exception in this variable and raise it later
-        self._hook_exception: Exception = None  
+        self._hook_exception: Exception = None
+        self._trace_buf: array.array = None
+        self._trace_count: list = None
+        self._trace_handle = None
 
         self._uc.hook_add(unicorn.UC_HOOK_MEM_INVALID, self._mem_invalid_hook)
         
@@ -248,7 +287,12 @@ class Emulator(Debugger):
         if uc_type is None:
             raise UnsupportedError(f'Hook type {hook.type} is not supported by unicorn')
 
-        if hook.type is HookType.CODE or hook.type is HookType.BLOCK:
+        if hook.type is HookType.CODE and hook.func is HOOK_STOP:
+            #Fast path for plain stop hooks - no need for the generic hook machinery
+            callback = self._stop_code_hook
+        elif hook.type is HookType.CODE and hook.func is HOOK_BREAK:
+            callback = self._break_code_hook
+        elif hook.type is HookType.CODE or hook.type is HookType.BLOCK:
             callback = self._code_hook
         elif hook.type is HookType.INTERRUPT:
             callback = self._interrupt_hook
@@ -265,6 +309,46 @@ class Emulator(Debugger):
     def remove_hook(self, hook: Hook):
         self._uc.hook_del(hook._data)
 
+    def trace_pcs(self, capacity):
+        """
+        Start recording the address of every executed instruction.
+
+        The addresses are stored in a preallocated buffer of `capacity` entries
+        (extra instructions are silently dropped), avoiding the cost of a full
+        Python hook per instruction.  Use `get_trace()` to retrieve the
+        recorded addresses and `stop_trace()` to stop recording.
+        """
+        if self._trace_handle is not None:
+            raise MegastoneError('A trace is already active')
+
+        buf = array.array('Q', bytes(8 * capacity))
+        count = [0]  #in a list so the callback can update it without attribute access
+
+        def callback(uc, address, size, user_data):
+            index = count[0]
+            if index < capacity:
+                buf[index] = address
+                count[0] = index + 1
+
+        self._trace_buf = buf
+        self._trace_count = count
+        self._trace_handle = self._uc.hook_add(unicorn.UC_HOOK_CODE, callback)
+
+    def get_trace(self):
+        """Return the instruction addresses recorded since `trace_pcs()` was called."""
+        if self._trace_buf is None:
+            raise MegastoneError('No trace is active')
+        return list(self._trace_buf[:self._trace_count[0]])
+
+    def stop_trace(self):
+        """Stop recording instruction addresses and return the recorded trace."""
+        trace = self.get_trace()
+        self._uc.hook_del(self._trace_handle)
+        self._trace_buf = None
+        self._trace_count = None
+        self._trace_handle = None
+        return trace
+
     def stop(self):
         super().stop()
         self._uc.emu_stop()
@@ -281,17 +365,28 @@ class Emulator(Debugger):
         with self._catch_hook_exceptions():
             self._handle_hook(hook)
 
+    def _stop_code_hook(self, uc, address, size, hook: Hook):
+        #HOOK_STOP stops unconditionally, so we can skip _handle_hook entirely
+        self._stop_hook = hook
+        self._uc.emu_stop()
+
+    def _break_code_hook(self, uc, address, size, hook: Hook):
+        #Same as BreakHookFunc, without the generic hook bookkeeping
+        if self.start_pc != self.pc:
+            self._stop_hook = hook
+            self._uc.emu_stop()
+
     def _data_hook(self, uc, uc_access, address, size, value, hook: Hook):
         with self._catch_hook_exceptions():
-            access_type = UC_ACCESS_TO_ACCESS_TYPE[uc_access]
+            access_type = UC_ACCESS_TO_ACCESS_TYPE_TABLE[uc_access]
             value = self._get_access_value(access_type, size, value)
             access = Access(access_type, address, size, value)
             self._handle_hook(hook, access)
 
     def _mem_invalid_hook(self, uc, uc_access, address, size, value, user_data):
         with self._catch_hook_exceptions():
-            cause = UC_ACCESS_TO_FAULT_CAUSE.get(uc_access, None)
-            access_type = UC_ACCESS_TO_ACCESS_TYPE.get(uc_access, None)
+            cause = UC_ACCESS_TO_FAULT_CAUSE_TABLE[uc_access] if uc_access < len(UC_ACCESS_TO_FAULT_CAUSE_TABLE) else None
+            access_type = UC_ACCESS_TO_ACCESS_TYPE_TABLE[uc_access] if uc_access < len(UC_ACCESS_TO_ACCESS_TYPE_TABLE) else None
             value = self._get_access_value(access_type, size, value)
 
             if cause is not None and access_type is not None:
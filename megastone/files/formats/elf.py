@@ -28,6 +28,8 @@ SECTION_FLAG_TO_ACCESS_TYPE = {
 class BaseELFSegment(Segment, metaclass=abc.ABCMeta):
     """Base class for ELF segments."""
 
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def file_offset(self):
@@ -42,6 +44,8 @@ class BaseELFSegment(Segment, metaclass=abc.ABCMeta):
 
 
 class ELFSectionSegment(BaseELFSegment):
+    __slots__ = ('_section',)
+
     def __init__(self, mem, section: elffile.Section):
         if section.compressed:
             raise UnsupportedError('ELF compression is not supported')
@@ -63,6 +67,8 @@ class ELFSectionSegment(BaseELFSegment):
 
 
 class ELFSegmentSegment(BaseELFSegment):
+    __slots__ = ('_segment',)
+
     def __init__(self, name, mem, elf_segment: elffile.Segment):
         perms = convert_flags(SEGMENT_FLAG_TO_ACCESS_TYPE, elf_segment['p_flags'])
         super().__init__(name, elf_segment['p_vaddr'], elf_segment['p_memsz'], perms, mem)
@@ -7,6 +7,10 @@ from dataclasses import dataclass
 class AddressRange:
     """Represents a range of addresses"""
 
+    #Manual __slots__ (the dataclass slots flag needs python 3.10) - ranges and
+    #segments are created in bulk and their fields are read on every lookup
+    __slots__ = ('start', 'size')
+
     start: int
     size: int
 
@@ -1,3 +1,5 @@
+import mmap
+
 from megastone.errors import MegastoneError
 from .segments import MappableMemory, SplittingSegmentMemory, Segment
 from .access import AccessType
@@ -5,10 +7,19 @@ from .access import AccessType
 
 class BufferSegment(Segment):
     """Segment subclass that also contains an internal buffer for storing the data."""
+
+    __slots__ = ('_data',)
+
     def __init__(self, name, start, size, perms, mem):
         super().__init__(name, start, size, perms, mem)
-        self._data = bytearray(size)
-        
+        #An anonymous mmap gives us lazily-committed zero pages, so mapping a
+        #huge segment (e.g. a large firmware ROM) doesn't eagerly allocate and
+        #zero-fill host memory like bytearray(size) would.
+        if size > 0:
+            self._data = mmap.mmap(-1, size)
+        else:
+            self._data = bytearray()
+
 
 class BufferMemory(MappableMemory, SplittingSegmentMemory):
     """
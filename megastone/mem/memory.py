@@ -3,10 +3,11 @@ from __future__ import annotations
 import abc
 from pathlib import Path
 import shutil
+import struct
 from typing import TYPE_CHECKING
 
-from megastone.arch import Architecture, InstructionSet, DisassemblyError
-from megastone.util import Closeable
+from megastone.arch import Architecture, Endian, InstructionSet, DisassemblyError
+from megastone.util import Closeable, size_to_mask
 from .errors import MemoryAccessError
 from .memory_io import StreamMemoryIO, MemoryIO
 
@@ -15,15 +16,30 @@ if TYPE_CHECKING:
     from .segments import Segment
 
 
+#Buffer size for memory<->file copies. The 16KiB copyfileobj default is
+#undersized for memory-backed streams where per-call overhead dominates.
+COPY_BUFFER_SIZE = 1 << 20
+
+
 class Memory(Closeable):
     """Abstract class representing a memory space."""
 
     DISASSEMBLY_CHUNK_SIZE = 0x400
+    SEARCH_CHUNK_SIZE = 0x100000  #1MiB - keeps the search working set small without many read() calls
+
+    INT_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
 
     def __init__(self, arch: Architecture):
         self.arch = arch
         self.default_isa: InstructionSet = arch.default_isa
         self.verbose = False
+        #Bind hot attribute chains once - the interpreter can't hoist these itself
+        self._word_size = arch.word_size
+        self._encode_word = arch.encode_word
+        self._decode_word = arch.decode_word
+        #Precompiled structs for the common fixed-size integer accesses
+        prefix = '<' if arch.endian is Endian.LITTLE else '>'
+        self._int_structs = {size: struct.Struct(prefix + char) for size, char in self.INT_FORMATS.items()}
 
     @abc.abstractmethod
     def _write(self, address, data):
@@ -57,20 +73,29 @@ class Memory(Closeable):
     def read_int(self, address, size, *, signed=False):
         """Read an integer from the given address."""
         data = self.read(address, size)
+        if not signed:
+            int_struct = self._int_structs.get(size)
+            if int_struct is not None:
+                return int_struct.unpack(data)[0]
         return self.arch.endian.decode_int(data, signed=signed)
 
     def write_int(self, address, value, size):
         """Write an integer to the given address."""
-        data = self.arch.endian.encode_int(value, size)
+        int_struct = self._int_structs.get(size)
+        if int_struct is not None and 0 <= value <= size_to_mask(size):
+            data = int_struct.pack(value)
+        else:
+            data = self.arch.endian.encode_int(value, size)
         self.write(address, data)
 
     def read_word(self, address, *, signed=False):
         """Read an arch-word from the given address."""
-        return self.read_int(address, self.arch.word_size, signed=signed)
-    
+        data = self.read(address, self._word_size)
+        return self._decode_word(data, signed=signed)
+
     def write_word(self, address, value):
         """Write an arch-word to the given address."""
-        self.write_int(address, value, self.arch.word_size)
+        self.write(address, self._encode_word(value))
     
     def read_byte(self, address):
         return self.read_int(address, 1)
@@ -103,6 +128,26 @@ class Memory(Closeable):
         It might be a good idea to override this in a subclass if there is a faster implementation.
         """
         result = bytearray()
+        chunk_size = 64
+        while len(result) < max_size:
+            curr_size = min(chunk_size, max_size - len(result))
+            try:
+                chunk = self.read(address + len(result), curr_size)
+            except MemoryAccessError:
+                #The chunk may cross into unmapped memory even if the string
+                #itself doesn't - finish the scan one byte at a time
+                if curr_size == 1:
+                    raise
+                return self._read_cstring_bytes_slow(address, max_size, result)
+            index = chunk.find(b'\x00')
+            if index != -1:
+                result += chunk[:index]
+                break
+            result += chunk
+            chunk_size = min(chunk_size * 2, 4096)
+        return bytes(result)
+
+    def _read_cstring_bytes_slow(self, address, max_size, result: bytearray):
         while len(result) < max_size:
             byte = self.read_byte(address + len(result))
             if byte == 0:
@@ -171,27 +216,40 @@ class Memory(Closeable):
         else:
             insn_limit = max_num
 
+        #Hoist loop invariants out of the per-chunk bookkeeping
+        min_insn_size = isa.min_insn_size
+        max_insn_size = isa.max_insn_size
+        #Scale the chunk to the ISA so the per-chunk read/Capstone setup cost
+        #is amortized over at least ~256 instructions even on long-insn ISAs
+        chunk_limit = max(self.DISASSEMBLY_CHUNK_SIZE, 256 * max_insn_size)
+        scan_limit = max_size - min_insn_size
+
         count = 0
         offset = 0
-        while count < insn_limit and offset <= max_size - isa.min_insn_size:
+        while count < insn_limit and offset <= scan_limit:
             insns_remaining = insn_limit - count
             size_remaining = max_size - offset
             curr_address = address + offset
 
-            read_size = min(size_remaining, insns_remaining * isa.max_insn_size, self.DISASSEMBLY_CHUNK_SIZE)
+            read_size = min(size_remaining, insns_remaining * max_insn_size, chunk_limit)
             chunk = self.read(curr_address, read_size)
 
-            total_size = 0
             if max_num is None:
                 curr_max = None
             else:
                 curr_max = insns_remaining
-            for insn in isa.disassemble(chunk, curr_address, count=curr_max):
-                yield insn
-                total_size += insn.size
-                count += 1
+            #Materialize the chunk's instructions so the total size comes from
+            #the last one instead of a per-instruction accumulation
+            insns = list(isa.disassemble(chunk, curr_address, count=curr_max))
+            if insns:
+                last = insns[-1]
+                total_size = last.address + last.size - curr_address
+            else:
+                total_size = 0
+            count += len(insns)
+            yield from insns
 
-            if read_size == size_remaining or read_size - total_size >= isa.max_insn_size:
+            if read_size == size_remaining or read_size - total_size >= max_insn_size:
                 #too many bytes remain - we must have hit an invalid instruction
                 break
 
@@ -214,7 +272,7 @@ class Memory(Closeable):
             count += 1
 
     def _disassemble_one_unknown_size(self, address, isa: InstructionSet):
-        for size in reversed(isa.insn_sizes):
+        for size in isa.insn_sizes_desc:
             try:
                 data = self.read(address, size)
             except MemoryAccessError:
@@ -240,7 +298,7 @@ class Memory(Closeable):
     def write_fileobj(self, address, fileobj):
         """Write data from the file object to the given address."""
         dest = self.create_fileobj(address)
-        shutil.copyfileobj(fileobj, dest)
+        shutil.copyfileobj(fileobj, dest, COPY_BUFFER_SIZE)
 
     def write_file(self, address, path):
         """Write the file at the given path to memory."""
@@ -250,7 +308,7 @@ class Memory(Closeable):
     def dump_to_fileobj(self, address, size, fileobj):
         """Write data from memory to a file object."""
         src = self.create_fileobj(address, size)
-        shutil.copyfileobj(src, fileobj)
+        shutil.copyfileobj(src, fileobj, COPY_BUFFER_SIZE)
 
     def dump_to_file(self, address, size, path):
         """Dump bytes at the given area to the given path."""
@@ -263,17 +321,29 @@ class Memory(Closeable):
 
         It might be a good idea to override this in a subclass if a more efficient implementation is available.
         """
-        #In the future it may be needed to improve performance by reading in chunks
-        data = self.read(start, size)
-        search_start = 0
-        while True:
-            offset = data.find(value, search_start)
-            if offset == -1:
-                return None
-            address = start + offset
-            if address % alignment == 0:
-                return address
-            search_start = offset + 1
+        #Search in overlapping chunks so we never materialize the whole range
+        #and can stop early on a hit
+        overlap = len(value) - 1
+        chunk_size = self.SEARCH_CHUNK_SIZE
+        #Alignments are almost always powers of two - test those with a bitmask
+        if alignment & (alignment - 1) == 0:
+            align_mask = alignment - 1
+        else:
+            align_mask = None
+        for offset in range(0, size, chunk_size):
+            read_size = min(chunk_size + overlap, size - offset)
+            data = self.read(start + offset, read_size)
+            search_start = 0
+            while True:
+                found = data.find(value, search_start)
+                if found == -1 or found >= chunk_size:
+                    #Matches starting inside the overlap are found by the next chunk
+                    break
+                address = start + offset + found
+                if (address & align_mask if align_mask is not None else address % alignment) == 0:
+                    return address
+                search_start = found + 1
+        return None
 
     def __getitem__(self, key):
         #Expose memory as a bytes-like object, so we can write e.g. memory[0x4:0x8]
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import abc
+import array
+import bisect
 from collections.abc import Iterable
-import io
+import mmap
+import os
 from megastone.mem.errors import MemoryReadError, MemoryWriteError
 
 from megastone.arch import Architecture
@@ -20,6 +23,8 @@ ALLOC_ROUND_SIZE = 0x1000
 class Segment(AddressRange):
     """Represents an area of memory."""
 
+    __slots__ = ('name', 'perms', 'mem', '_repr')
+
     name: str
     perms: AccessType
     mem: Memory
@@ -29,9 +34,12 @@ class Segment(AddressRange):
         self.name = name
         self.perms = perms
         self.mem = mem
-    
+        self._repr = None  #memoized repr - segments are immutable
+
     def __repr__(self):
-        return f"<Segment '{self.name}' at 0x{self.start:X}-0x{self.end:X}, {self.perms}>"
+        if self._repr is None:
+            self._repr = f"<Segment '{self.name}' at 0x{self.start:X}-0x{self.end:X}, {self.perms}>"
+        return self._repr
 
     def __eq__(self, other):
         return (
@@ -84,6 +92,7 @@ class SegmentMemory(Memory):
     def __init__(self, arch: Architecture):
         super().__init__(arch)
         self.segments = SegmentMapping(self)
+        self._asm_cache: dict[tuple, bytes] = {}  #assembled code by (assembly, isa)
 
     def search_all(self, value, *, alignment=1, perms=AccessType.NONE):
         """
@@ -101,7 +110,12 @@ class SegmentMemory(Memory):
         """Search for the given assembly instructions in all executable segments."""
         isa = self._fix_isa(isa)
 
-        code = isa.assemble(assembly)
+        #Repeated searches (e.g. gadget scanning) reuse the same snippets -
+        #assembling is far more expensive than the cache probe
+        key = (assembly, isa)
+        code = self._asm_cache.get(key)
+        if code is None:
+            code = self._asm_cache[key] = isa.assemble(assembly)
         return self.search_all(code, alignment=isa.insn_alignment, perms=AccessType.X)
 
     def is_mapped(self, address, size=1):
@@ -128,13 +142,37 @@ class SegmentMemory(Memory):
                 return seg
         raise KeyError(f'No such segment "{name}"')
 
+    def _has_segment(self, name):
+        #Override if more efficient implementation is available
+        try:
+            self._get_segment_by_name(name)
+        except KeyError:
+            return False
+        return True
+
     def _get_segment_by_address(self, address):
         #Override if more efficient implementation is available
+        #The containment check is inlined - a method call per segment adds up in this scan
         for seg in self._get_all_segments():
-            if seg.contains(address):
+            start = seg.start
+            if start <= address < start + seg.size:
                 return seg
         raise KeyError(f'No segment contains address 0x{address:X}')
 
+    def _get_adjacent_segment(self, seg: Segment):
+        #Return the segment starting exactly at seg.end, or None.
+        #Override if more efficient implementation is available
+        try:
+            return self._get_segment_by_address(seg.end)
+        except KeyError:
+            return None
+
+    def _get_segments_with_perms(self, perms):
+        #Override if more efficient implementation is available
+        for seg in self._get_all_segments():
+            if seg.perms.contains(perms):
+                yield seg
+
     def _get_max_read_size(self, address):
         try:
             seg = self._get_segment_by_address(address)
@@ -161,19 +199,13 @@ class SegmentMapping(NamespaceMapping[Segment]):
     
     def with_perms(self, perms):
         """Return an iterable of all segments that contain the given AccessType."""
-        for seg in self:
-            if seg.perms.contains(perms):
-                yield seg
+        return self._mem._get_segments_with_perms(perms)
 
     def __len__(self):
         return self._mem._num_segments()
 
     def __contains__(self, name):
-        try:
-            self._mem._get_segment_by_name(name)
-        except KeyError:
-            return False
-        return True
+        return self._mem._has_segment(name)
 
 
 class DictSegmentMemory(SegmentMemory):
@@ -182,6 +214,19 @@ class DictSegmentMemory(SegmentMemory):
     def __init__(self, arch: Architecture):
         super().__init__(arch)
         self._segments: dict[str, Segment] = {}
+        self._sorted_segments: list[Segment] = []
+        #Parallel start/end sequences - searches and range checks scan these
+        #without dereferencing the Segment objects. Starts are packed machine
+        #words; ends stay a list since a segment ending exactly at the top of
+        #a 64-bit space would overflow a 'Q' array.
+        #Zero-size segments are kept out of the arrays (and in _empty_segments
+        #instead): they can never contain an address, and a start==end entry
+        #would stall the adjacency walk and shadow real segments in the bisect.
+        self._seg_starts = array.array('Q')
+        self._seg_ends: list[int] = []
+        self._empty_segments: list[Segment] = []
+        self._last_seg: Segment = None  #single-entry cache for address lookups
+        self._perms_cache: dict[AccessType, tuple[Segment, ...]] = {}
 
     def _get_all_segments(self):
         return self._segments.values()
@@ -192,21 +237,106 @@ class DictSegmentMemory(SegmentMemory):
     def _get_segment_by_name(self, name):
         return self._segments[name]
 
+    def _has_segment(self, name):
+        return name in self._segments
+
+    def _get_segment_by_address(self, address):
+        #Consecutive lookups usually hit the same segment, so check the last one first
+        seg = self._last_seg
+        if seg is not None and seg.contains(address):
+            return seg
+
+        #Binary search over the sorted start addresses instead of a linear scan
+        index = bisect.bisect(self._seg_starts, address) - 1
+        if index >= 0 and address < self._seg_ends[index]:
+            seg = self._sorted_segments[index]
+            self._last_seg = seg
+            return seg
+        raise KeyError(f'No segment contains address 0x{address:X}')
+
     def _check_segment(self, seg: Segment):
         #Can be called to verify a segment before processing it
         if seg.name in self._segments:
             raise MegastoneError(f'Segment with name "{seg.name}" already exists')
 
-        for old_seg in self.segments:
-            if old_seg.overlaps(seg):
+        index = bisect.bisect(self._seg_starts, seg.start)
+
+        if seg.size == 0:
+            #An empty range overlaps a segment only if its point is strictly
+            #inside it; at a boundary overlaps() is False, so allow it
+            if index > 0 and self._seg_starts[index - 1] < seg.start < self._seg_ends[index - 1]:
+                raise MegastoneError('Segment overlap')
+            return
+
+        #Existing segments are disjoint and sorted by start, so only the two
+        #nearest neighbors in start order can overlap the new segment
+        if index > 0 and self._seg_ends[index - 1] > seg.start:
+            raise MegastoneError('Segment overlap')
+        if index < len(self._seg_starts) and self._seg_starts[index] < seg.end:
+            raise MegastoneError('Segment overlap')
+
+        #Empty segments aren't in the arrays; one strictly inside the new
+        #range still overlaps it
+        for empty in self._empty_segments:
+            if seg.start < empty.start < seg.end:
                 raise MegastoneError('Segment overlap')
 
     def _add_segment(self, seg: Segment):
         #Call in a subclass to initialize segments
         self._check_segment(seg)
         self._segments[seg.name] = seg
+        if seg.size == 0:
+            self._empty_segments.append(seg)
+        else:
+            index = bisect.bisect(self._seg_starts, seg.start)
+            self._sorted_segments.insert(index, seg)
+            self._seg_starts.insert(index, seg.start)
+            self._seg_ends.insert(index, seg.end)
+        self._last_seg = None
+        self._perms_cache.clear()
         return seg
 
+    def _remove_segment(self, seg: Segment):
+        #Call in a subclass to remove an existing segment
+        del self._segments[seg.name]
+        if seg.size == 0:
+            self._empty_segments.remove(seg)
+        else:
+            index = bisect.bisect_left(self._seg_starts, seg.start)
+            del self._sorted_segments[index]
+            del self._seg_starts[index]
+            del self._seg_ends[index]
+        self._last_seg = None
+        self._perms_cache.clear()
+
+    def _overlaps_range(self, start, end):
+        #True if any segment overlaps the range [start, end); an empty range
+        #overlaps only a segment whose interior contains its point
+        index = bisect.bisect(self._seg_starts, start) - 1
+        if start == end:
+            return index >= 0 and self._seg_starts[index] < start < self._seg_ends[index]
+        if index >= 0 and self._seg_ends[index] > start:
+            return True
+        return index + 1 < len(self._seg_starts) and self._seg_starts[index + 1] < end
+
+    def _get_adjacent_segment(self, seg: Segment):
+        #The arrays hold only non-empty segments, so this never returns a
+        #zero-size segment that would stall the read/write walk
+        index = bisect.bisect_left(self._seg_starts, seg.end)
+        if index < len(self._seg_starts) and self._seg_starts[index] == seg.end:
+            return self._sorted_segments[index]
+        return None
+
+    def _get_segments_with_perms(self, perms):
+        #Lazily build an immutable per-perms index so repeated queries
+        #(e.g. search_code over executable segments) don't rescan everything
+        segs = self._perms_cache.get(perms)
+        if segs is None:
+            #Iterate all segments (not just the arrays) so empty ones are included
+            segs = tuple(seg for seg in self._get_all_segments() if seg.perms.contains(perms))
+            self._perms_cache[perms] = segs
+        return segs
+
 
 class MappableMemory(DictSegmentMemory):
     """Abstract SegmentMemory subclass that supports allocating new segments at arbitrary addresses."""
@@ -228,6 +358,76 @@ class MappableMemory(DictSegmentMemory):
         self._add_segment(seg)
         return seg
 
+    def map_fused(self, address, size, name=None, perms=AccessType.RWX):
+        """
+        Like map(), but fuse the new range with touching segments that have the same permissions.
+
+        Fused neighbors are replaced by a single merged segment (keeping their data),
+        so mapping many small contiguous ranges doesn't inflate the segment count -
+        every later lookup and split access stays fast.
+        Returns the Segment containing the new range.
+        """
+        left = self._find_left_neighbor(address, perms)
+        right = self._find_right_neighbor(address + size, perms)
+        if left is None and right is None:
+            return self.map(address, size, name=name, perms=perms)
+
+        start = left.start if left is not None else address
+        end = right.end if right is not None else address + size
+        if name is None:
+            name = left.name if left is not None else right.name
+        elif not isinstance(name, str):
+            raise ValueError('Segment name must be a string')
+
+        #Validate everything before removing the neighbors - once they are gone
+        #there is no clean way back, so any failure must happen up front
+        removed_names = {seg.name for seg in (left, right) if seg is not None}
+        if name in self._segments and name not in removed_names:
+            raise MegastoneError(f'Segment with name "{name}" already exists')
+        if self._overlaps_range(address, address + size):
+            raise MegastoneError('Segment overlap')
+        for empty in self._empty_segments:
+            if start < empty.start < end:
+                raise MegastoneError('Segment overlap')
+        merged = self._create_segment(name, start, end - start, perms)
+
+        left_data = left.read() if left is not None else None
+        right_data = right.read() if right is not None else None
+        for seg in (left, right):
+            if seg is not None:
+                self._remove_segment(seg)
+                self._handle_removed_segment(seg)
+
+        self._handle_new_segment(merged)
+        self._add_segment(merged)
+        if left_data is not None:
+            self.write(left.start, left_data)
+        if right_data is not None:
+            self.write(right.start, right_data)
+        return merged
+
+    def _find_left_neighbor(self, start, perms):
+        #Return the segment ending exactly at start with the given permissions, if any
+        if start <= 0:
+            return None
+        try:
+            seg = self.segments.by_address(start - 1)
+        except KeyError:
+            return None
+        if seg.end == start and seg.perms == perms:
+            return seg
+        return None
+
+    def _find_right_neighbor(self, end, perms):
+        #Return the segment starting exactly at end with the given permissions, if any
+        try:
+            seg = self.segments.by_address(end)
+        except KeyError:
+            return None
+        if seg.start == end and seg.perms == perms:
+            return seg
+        return None
+
     def load(self, address, data, name=None, perms=AccessType.RWX):
         """Shorthand for map() followed by write()."""
         seg = self.map(address, len(data), name=name, perms=perms)
@@ -237,11 +437,18 @@ class MappableMemory(DictSegmentMemory):
     def load_file(self, address, path, name=None, perms=AccessType.RWX):
         """Load the file at the given path."""
         with open(path, 'rb') as file:
-            file.seek(0, io.SEEK_END)
-            size = file.tell()
+            size = os.fstat(file.fileno()).st_size
             self.map(address, size, name=name, perms=perms)
-            file.seek(0)
-            self.write_fileobj(address, file)
+            if size == 0:
+                return
+            try:
+                source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                #mmap can fail for special files - fall back to plain reads
+                self.write_fileobj(address, file)
+            else:
+                with source:
+                    self.write_fileobj(address, source)
 
     def load_memory(self, mem: SegmentMemory):
         """Copy all segments from the given SegmentMemory into this memory."""
@@ -257,29 +464,38 @@ class MappableMemory(DictSegmentMemory):
         """Handle a newly created segment after it has been verified but before it has been added."""
         pass
 
+    def _handle_removed_segment(self, seg: Segment):
+        """Handle a segment after it has been removed (currently only by map_fused())."""
+        pass
+
     def _create_segment(self, name, start, size, perms) -> Segment:
         """Can override in subclass to customize segment creation."""
         return Segment(name, start, size, perms, self)
 
     def _allocate_address(self, size):
-        segs = sorted(self.segments, key=lambda seg: seg.start)
-
-        if len(segs) == 0:
+        #The segment list is already maintained in start order. Empty segments
+        #aren't in it, but a new segment can't contain their point either, so
+        #they split the free space just like a zero-size range would
+        bounds = [(seg.start, seg.end) for seg in self._sorted_segments]
+        bounds.extend((seg.start, seg.start) for seg in self._empty_segments)
+        bounds.sort()
+
+        if len(bounds) == 0:
             return MIN_ALLOC_ADDRESS
 
-        address = self._allocate_in_range(MIN_ALLOC_ADDRESS, segs[0].start, size)
+        address = self._allocate_in_range(MIN_ALLOC_ADDRESS, bounds[0][0], size)
         if address is not None:
             return address
 
-        for i, seg in enumerate(segs[:-1]):
-            address = self._allocate_in_range(seg.end, segs[i+1].start, size)
+        for i, (_, end) in enumerate(bounds[:-1]):
+            address = self._allocate_in_range(end, bounds[i+1][0], size)
             if address is not None:
                 return address
 
-        address = self._allocate_in_range(segs[-1].end, self.arch.max_mem_size, size)
+        address = self._allocate_in_range(bounds[-1][1], self.arch.max_mem_size, size)
         if address is not None:
             return address
-        
+
         raise MegastoneError(f'No address of size 0x{size:X} is available')
 
     def _allocate_in_range(self, start, end, size):
@@ -308,33 +524,83 @@ class SplittingSegmentMemory(SegmentMemory):
         """Write data to the given segment at the given offset"""
 
     def _read(self, address, size):
+        if size == 0:
+            return b''
+
+        #Fast path - the vast majority of reads fall entirely within one segment
+        try:
+            seg = self.segments.by_address(address)
+        except KeyError as e:
+            raise MemoryReadError(address, size, 'unmapped') from e
+        if address + size <= seg.end:
+            return bytes(self._read_segment(seg, address - seg.start, size))
+
+        #Fill a preallocated buffer so each segment's data is copied only once
+        result = bytearray(size)
+        pos = 0
         try:
-            offsets = list(self._get_data_offsets(address, size))
+            for seg, start, seg_size in self._get_data_offsets(address, size):
+                result[pos : pos + seg_size] = self._read_segment(seg, start, seg_size)
+                pos += seg_size
         except KeyError as e:
             raise MemoryReadError(address, size, 'unmapped') from e
-        return b''.join(self._read_segment(seg, start, size) for seg, start, size in offsets)
+        return bytes(result)
 
     def _write(self, address, data):
-        offset = 0
-        #we call list() to detect any errors before starting to write
+        if len(data) == 0:
+            return
+
+        #Fast path - the vast majority of writes fall entirely within one segment
         try:
-            offsets = list(self._get_data_offsets(address, len(data)))
+            seg = self.segments.by_address(address)
+        except KeyError as e:
+            raise MemoryWriteError(address, data, 'unmapped') from e
+        if address + len(data) <= seg.end:
+            self._write_segment(seg, address - seg.start, data)
+            return
+
+        #Validate the whole range up front so we never do a partial write,
+        #without materializing the offset list
+        try:
+            self._check_range(seg, address + len(data))
         except KeyError as e:
             raise MemoryWriteError(address, data, 'unmapped') from e
-        for seg, start, size in offsets: 
+
+        offset = 0
+        for seg, start, size in self._get_data_offsets(address, len(data)):
             self._write_segment(seg, start, data[offset : offset + size])
             offset += size
 
+    def _check_range(self, seg: Segment, end_address):
+        #Verify that the adjacent segments starting at seg cover memory up to end_address
+        while seg.end < end_address:
+            seg = self._get_adjacent_segment(seg)
+            if seg is None:
+                raise KeyError('Unmapped range')
+
     def _get_data_offsets(self, address, size):
         #We need to deal with the case of a read/write that spans two adjacent segments
         #This function yields segment, start_offset, size containing given address range
         curr_address = address
         end_address = address + size
-
-        while curr_address < end_address:
-            seg = self.segments.by_address(curr_address)
-            start_offset = curr_address - seg.start
-            end_offset = min(end_address - seg.start, seg.size)
+        if curr_address >= end_address:
+            return
+        seg = self.segments.by_address(curr_address)
+
+        get_adjacent = self._get_adjacent_segment  #pre-bound - called once per hop
+        while True:
+            seg_start = seg.start
+            seg_size = seg.size
+            start_offset = curr_address - seg_start
+            #Branch instead of min() - saves a call per segment
+            remaining = end_address - seg_start
+            end_offset = remaining if remaining < seg_size else seg_size
             yield seg, start_offset, end_offset - start_offset
 
-            curr_address = seg.start + end_offset
\ No newline at end of file
+            curr_address = seg_start + end_offset
+            if curr_address >= end_address:
+                return
+            #Step directly to the adjacent segment instead of a full lookup
+            seg = get_adjacent(seg)
+            if seg is None:
+                raise KeyError(f'No segment contains address 0x{curr_address:X}')
\ No newline at end of file
@@ -15,38 +15,38 @@ def get_id(arch_isa):
     return arch.name
 
 
-@pytest.fixture(params=[(arch, isa) for arch in Architecture.all() for isa in arch.isas if arch.fully_supported], ids=get_id)
+@pytest.fixture(scope='session', params=[(arch, isa) for arch in Architecture.all() for isa in arch.isas if arch.fully_supported], ids=get_id)
 def arch_isa(request):
     return request.param
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def arch(arch_isa):
     return arch_isa[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def isa(arch_isa):
     return arch_isa[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def nop(isa):
     return isa.assemble('nop')
 
-@pytest.fixture(params=[(arch, isa) for arch in ARMArchitecture.all() for isa in arch.isas], ids=get_id)
+@pytest.fixture(scope='session', params=[(arch, isa) for arch in ARMArchitecture.all() for isa in arch.isas], ids=get_id)
 def arm_arch_isa(request):
     return request.param
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def arm_arch(arm_arch_isa):
     return arm_arch_isa[0]
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def arm_isa(arm_arch_isa):
     return arm_arch_isa[1]
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def other_arm_isa(arm_arch, arm_isa):
     if arm_isa is arm_arch.arm:
         return arm_arch.thumb
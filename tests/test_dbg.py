@@ -165,6 +165,17 @@ def test_run_until(arch_dbg, nop):
     arch_dbg.run_until(stop_address)
     assert arch_dbg.pc == stop_address
 
+def test_run_until_cond(arch_dbg, nop):
+    stop_address = CODE_ADDRESS + len(nop)*10
+
+    reason = arch_dbg.run_until_cond(lambda dbg: dbg.pc == stop_address)
+    assert reason.type is StopType.HOOK
+    assert arch_dbg.pc == stop_address
+
+    reason = arch_dbg.run_until_cond(lambda dbg: False, count=5)
+    assert reason.type is StopType.COUNT
+    assert arch_dbg.pc == stop_address + len(nop)*5
+
 class AccessHookFunc(CounterHookFunc):
     def __init__(self):
         super().__init__()
@@ -43,6 +43,17 @@ def test_unaligned(emu: Emulator):
     assert segment.start == 0x1080
     assert segment.size == 0x80
 
+def test_map_fused(emu: Emulator):
+    data = b'babafafa'
+    emu.mem.map(0x1000, 0x1000, 'code')
+    emu.mem.write(0x1000, data)
+    seg = emu.mem.map_fused(0x2000, 0x1000)
+    assert seg.start == 0x1000
+    assert seg.size == 0x2000
+    assert emu.mem.read(0x1000, len(data)) == data
+    assert emu.mem.read(0x2000, 0x1000) == bytes(0x1000)
+
+
 def test_from_mem():
     mem = BufferMemory(ARCH_ARM)
     mem.map(0x1000, 0x1000, 'seg')
@@ -134,6 +145,24 @@ def test_overlap_same(emu: Emulator):
     emu.mem.map(0x400, 0x200, 'seg2', AccessType.X)
 
 
+def test_trace_pcs(emu: Emulator):
+    count = 3
+
+    emu.mem.map(0x1000, 0x100, 'code')
+    emu.mem.write_code(0x1000, 'NOP;' * 10)
+    emu.trace_pcs(0x10)
+    emu.run(count, address=0x1000)
+
+    #The code hook also fires on the instruction the count limit stops at
+    expected = [0x1000 + i*4 for i in range(count + 1)]
+    assert emu.get_trace() == expected
+    assert emu.stop_trace() == expected
+
+    emu.trace_pcs(2)
+    emu.run(count, address=0x1000)
+    assert emu.stop_trace() == [0x1000, 0x1004]
+
+
 def test_save_context(emu: Emulator):
     emu.regs.set(r0=1, r2=56, pc=0x1050)
     assert emu.regs.get('r0', 'r2', 'pc') == (1, 56, 0x1050)
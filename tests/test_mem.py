@@ -311,6 +311,105 @@ def test_alloc_after_last():
     assert seg3.address == 0x2000
 
 
+def test_alloc_around_empty_segment():
+    mem = BufferMemory(ARCH_ARM)
+    mem.map(0x1800, 0, 'e')
+    #The gap below the empty segment is too small, so allocation skips past it
+    seg = mem.allocate(0x1000)
+    assert seg.address == 0x2000
+
+
+def test_map_fused(mem):
+    data = b'babafafa'
+    mem.map(0x10000, 0x1000, 'low')
+    mem.write(0x10000, data)
+    seg = mem.map_fused(0x11000, 0x1000)
+    assert seg.name == 'low'
+    assert seg.start == 0x10000
+    assert seg.size == 0x2000
+    assert len(mem.segments) == 2  #the original 'seg' plus the fused one
+    assert mem.read(0x10000, len(data)) == data
+    assert mem.read(0x11000, 0x1000) == bytes(0x1000)
+
+
+def test_map_fused_both_sides(mem):
+    mem.map(0x10000, 0x1000, 'low')
+    mem.map(0x12000, 0x1000, 'high')
+    mem.write(0x12000, b'high data')
+    seg = mem.map_fused(0x11000, 0x1000)
+    assert seg.start == 0x10000
+    assert seg.end == 0x13000
+    assert mem.read(0x12000, 9) == b'high data'
+
+
+def test_map_fused_different_perms(mem):
+    mem.map(0x10000, 0x1000, 'low', AccessType.R)
+    seg = mem.map_fused(0x11000, 0x1000, 'new')
+    assert seg.name == 'new'
+    assert seg.start == 0x11000
+    assert seg.size == 0x1000
+
+
+def test_map_fused_zero_size(mem):
+    mem.map(0x10000, 0x1000, 'a')
+    mem.map(0x11000, 0x1000, 'b')
+    mem.write(0x10000, b'adata')
+    mem.write(0x11000, b'bdata')
+    #A zero-size fuse at the shared boundary merges the two segments
+    seg = mem.map_fused(0x11000, 0)
+    assert seg.name == 'a'
+    assert seg.start == 0x10000
+    assert seg.end == 0x12000
+    assert mem.read(0x10000, 5) == b'adata'
+    assert mem.read(0x11000, 5) == b'bdata'
+
+
+def test_map_fused_overlap_failure(mem):
+    data = b'keep me'
+    mem.map(0x10000, 0x1000, 'low')
+    mem.write(0x10000, data)
+    mem.map(0x11400, 0x400, 'island')
+    with pytest.raises(MegastoneError):
+        mem.map_fused(0x11000, 0x1000)
+    #The failed fuse must leave the neighbor and its data intact
+    assert mem.segments.low.size == 0x1000
+    assert mem.read(0x10000, len(data)) == data
+
+
+def test_map_fused_locked(mem):
+    mem.lock()
+    with pytest.raises(MegastoneError):
+        mem.map_fused(SEG_ADDRESS + SEG_SIZE, 0x1000)
+    assert len(mem.segments) == 1
+    assert mem.segments.seg.size == SEG_SIZE
+
+
+def test_map_fused_no_neighbors(mem):
+    seg = mem.map_fused(0x10000, 0x1000, 'new')
+    assert seg.start == 0x10000
+    assert seg.size == 0x1000
+
+
+def test_zero_size_segment_at_boundary(mem):
+    mem.map(0x10000, 0x1000, 'a')
+    mem.map(0x11000, 0, 'empty')
+    mem.map(0x11000, 0x1000, 'b')
+    mem.write(0x10000, b'A' * 0x1000)
+    mem.write(0x11000, b'B' * 0x1000)
+    #A zero-size segment at the boundary must not break the cross-segment walk
+    assert mem.read(0x10ff8, 16) == b'A' * 8 + b'B' * 8
+    assert mem.segments.by_address(0x11000).name == 'b'
+    assert mem.segments.empty.size == 0
+
+
+def test_zero_size_segment_overlap(mem):
+    #An empty segment at an existing segment's edge doesn't overlap it
+    empty = mem.map(SEG_ADDRESS, 0, 'empty')
+    assert empty.size == 0
+    with pytest.raises(MegastoneError):
+        mem.map(SEG_ADDRESS + 8, 0, 'inside')
+
+
 def test_map_anon(mem):
     seg = mem.map(0xabcd, 0x1000)
     assert seg.address == 0xabcd